@@ -1,94 +1,230 @@
-import re
 import json
 import csv
 import os
 import argparse
-from datetime import datetime
-from collections import defaultdict
+import sys
+from datetime import datetime, timedelta
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+_TS_CACHE_SIZE = 1 << 16
+_BURST_SIZE = 5
+_BURST_WINDOW = timedelta(seconds=60)
+# Byte range handed to each worker when parsing a text log in parallel
+_PARALLEL_CHUNK_BYTES = 4 << 20
+# Log files are read once, front to back, so use large read buffers
+_READ_BUFFER = 1 << 20
+_WRITE_BUFFER = 1 << 20
+
+# Builds a per-level CSV row from a record in one C call
+_level_row = itemgetter("timestamp", "service", "host", "message")
+
+# orjson parses the JSON log file noticeably faster when it is installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Many log lines share the same second, so parse each distinct
+# timestamp string once. fromisoformat is implemented in C and much
+# faster than strptime, but it also accepts offsets, fractional seconds
+# and times without seconds. Only trust it when the result formats back
+# to the exact input; anything else, e.g. non-zero-padded dates, goes
+# through strptime so text logs accept exactly what _TS_FMT accepts.
+@lru_cache(maxsize=_TS_CACHE_SIZE)
+def _parse_text_timestamp(ts_str):
+    if len(ts_str) == 19:
+        try:
+            timestamp = datetime.fromisoformat(ts_str)
+        except ValueError:
+            pass
+        else:
+            if timestamp.isoformat(" ") == ts_str:
+                return timestamp
+
+    return datetime.strptime(ts_str, _TS_FMT)
+
 
+@lru_cache(maxsize=_TS_CACHE_SIZE)
+def _parse_iso_timestamp(ts_str):
+    return datetime.fromisoformat(ts_str)
 
 
 def parse_text_log(line):
-    pattern = r"(\S+ \S+) (\S+) (\S+) (\S+) (.+)"
-    match = re.match(pattern, line)
+    # Cheap shape check before doing any real work. %Y always takes four
+    # digits, and the shortest line strptime can accept is
+    # "YYYY-M-D H:M:S L S H M" (month, day and time may be unpadded).
+    if len(line) < 22 or line[4] != "-":
+        return None
+
+    parts = line.split(" ", 5)
 
-    if not match:
+    # The first five fields must be non-empty and free of any whitespace
+    # (tabs, \xa0, ...), not just ASCII spaces. Re-splitting them on all
+    # whitespace gives back the same fields only if that holds.
+    fields = parts[:5]
+    if len(parts) < 6 or not parts[5] or " ".join(fields).split() != fields:
         return None
 
+    day, time, level, service, host, message = parts
+
     try:
-        timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+        timestamp = _parse_text_timestamp(f"{day} {time}")
     except ValueError:
         return None
 
     return {
         "timestamp": timestamp,
-        "level": match.group(2),
-        "service": match.group(3),
-        "host": match.group(4),
-        "message": match.group(5)
+        "level": sys.intern(level),
+        "service": sys.intern(service),
+        "host": sys.intern(host),
+        "message": message
     }
 
 
-def read_logs(json_path, log_path):
+def _intern_fields(log):
+    # JSON records may carry null or non-string values; leave those alone
+    for key in ("level", "service", "host"):
+        value = log.get(key)
+        if type(value) is str:
+            log[key] = sys.intern(value)
+
+
+def _matches(log, service, host):
+    return (
+        (not service or log["service"] == service)
+        and (not host or log["host"] == host)
+    )
+
+
+def _parse_log_chunk(log_path, start, end, service=None, host=None):
+    # Parse the lines that start within [start, end) of the file. A line
+    # straddling `start` belongs to the previous chunk.
+    with open(log_path, "rb", buffering=_READ_BUFFER) as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        first = f.tell()
+        if first >= end:
+            return []
+
+        data = f.read(end - first)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+
+    # Split like text mode's universal newlines (\n, \r\n and a lone \r),
+    # so chunks yield the same lines as the sequential reader
+    text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
     logs = []
+    for parsed in map(parse_text_log, map(str.strip, text.split("\n"))):
+        if parsed and _matches(parsed, service, host):
+            logs.append(parsed)
+
+    return logs
 
-    # Validate input paths
+
+def _iter_text_logs_parallel(log_path, workers, service, host):
+    size = os.path.getsize(log_path)
+    bounds = list(range(0, size, _PARALLEL_CHUNK_BYTES)) + [size]
+    ranges = zip(bounds, bounds[1:])
+
+    # Keep only a couple of chunks per worker in flight and drop each one
+    # once it has been yielded, so memory stays bounded on large files
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(_parse_log_chunk, log_path, start, end, service, host)
+            for start, end in islice(ranges, workers * 2)
+        )
+        while pending:
+            logs = pending.popleft().result()
+            for start, end in islice(ranges, 1):
+                pending.append(pool.submit(_parse_log_chunk, log_path, start, end, service, host))
+            yield from logs
+            del logs
+
+
+def iter_logs(json_path, log_path, service=None, host=None, workers=1):
+    # Validate input paths here rather than in the generator, so a bad
+    # call fails immediately instead of on first iteration
     if not json_path and not log_path:
         raise ValueError("At least one input file must be provided")
 
+    return _iter_logs(json_path, log_path, service, host, workers)
+
+
+def _iter_logs(json_path, log_path, service, host, workers):
     # Read JSON logs
     if json_path:
         if not os.path.exists(json_path):
             print(f"WARNING: {json_path} not found")
         else:
-            with open(json_path, encoding="utf-8") as f:
-                json_logs = json.load(f)
-                for log in json_logs:
-                    log["timestamp"] = datetime.fromisoformat(log["timestamp"])
-                    logs.append(log)
+            with open(json_path, "rb") as f:
+                json_logs = _json_loads(f.read())
+            for log in json_logs:
+                if _matches(log, service, host):
+                    log["timestamp"] = _parse_iso_timestamp(log["timestamp"])
+                    _intern_fields(log)
+                    yield log
 
     # Read text logs
     if log_path:
         if not os.path.exists(log_path):
             print(f"WARNING: {log_path} not found")
         else:
-            with open(log_path, encoding="utf-8") as f:
-                for line in f:
-                    parsed = parse_text_log(line.strip())
-                    if parsed:
-                        logs.append(parsed)
+            # Parallel parsing is opt-in: shipping parsed records back from
+            # the workers is costly, so it only pays off on large files
+            # with several cores to spare
+            if workers > 1:
+                yield from _iter_text_logs_parallel(log_path, workers, service, host)
+            else:
+                with open(log_path, encoding="utf-8", buffering=_READ_BUFFER) as f:
+                    for parsed in map(parse_text_log, map(str.strip, f)):
+                        if parsed and _matches(parsed, service, host):
+                            yield parsed
 
-    return logs
+
+def read_logs(json_path, log_path):
+    return list(iter_logs(json_path, log_path))
 
 
 def filter_logs(logs, service=None, host=None):
-    return [
-        log for log in logs
-        if (not service or log["service"] == service)
-        and (not host or log["host"] == host)
-    ]
+    if not service and not host:
+        return logs
 
+    return [log for log in logs if _matches(log, service, host)]
 
-def detect_burst_errors(logs):
-    error_times = sorted(
-        [log["timestamp"] for log in logs if log["level"] == "ERROR"]
-    )
 
+def _find_bursts(error_times):
+    # Sliding window over the last five errors; a burst is five errors
+    # within one minute.
+    window = deque(maxlen=_BURST_SIZE)
     bursts = []
-    for i in range(len(error_times) - 4):
-        if (error_times[i + 4] - error_times[i]).total_seconds() <= 60:
-            bursts.append(error_times[i:i + 5])
+    for ts in error_times:
+        window.append(ts)
+        if len(window) == _BURST_SIZE and ts - window[0] <= _BURST_WINDOW:
+            bursts.append(list(window))
 
     return bursts
 
 
-def detect_long_running_issues(logs):
-    error_days = defaultdict(set)
+def detect_burst_errors(logs, presorted=False):
+    error_times = (log["timestamp"] for log in logs if log["level"] == "ERROR")
+    if not presorted:
+        error_times = sorted(error_times)
 
-    for log in logs:
-        if log["level"] == "ERROR":
-            error_days[log["message"]].add(log["timestamp"].date())
+    return _find_bursts(error_times)
 
+
+def _recurring_issues(error_days):
     return {
         msg: days
         for msg, days in error_days.items()
@@ -96,6 +232,28 @@ def detect_long_running_issues(logs):
     }
 
 
+def detect_long_running_issues(logs):
+    error_days = defaultdict(set)
+
+    for log in logs:
+        if log["level"] == "ERROR":
+            error_days[log["message"]].add(log["timestamp"].date())
+
+    return _recurring_issues(error_days)
+
+
+def _write_summary_file(summary, out_dir):
+    with open(os.path.join(out_dir, "daily_summary.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "level", "count"])
+
+        writer.writerows(
+            (day, level, count)
+            for day, levels in summary.items()
+            for level, count in levels.items()
+        )
+
+
 def write_daily_summary(logs, out_dir):
     os.makedirs(out_dir, exist_ok=True)
 
@@ -104,13 +262,35 @@ def write_daily_summary(logs, out_dir):
     for log in logs:
         summary[log["timestamp"].date()][log["level"]] += 1
 
-    with open(os.path.join(out_dir, "daily_summary.csv"), "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["date", "level", "count"])
+    _write_summary_file(summary, out_dir)
+
 
-        for day, levels in summary.items():
-            for level, count in levels.items():
-                writer.writerow([day, level, count])
+def _write_level_files(rows_by_level, out_dir):
+    for level, rows in rows_by_level.items():
+        path = os.path.join(out_dir, f"{level}.csv")
+        with open(path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "service", "host", "message"])
+            write = f.write
+
+            # Most rows need no quoting, so format them directly and only
+            # fall back to csv.writer when a field has a comma, quote or
+            # line break, or is None (csv writes "" where an f-string
+            # would write "None"). Output is identical to writer.writerow.
+            for timestamp, service, host, message in rows:
+                line = f"{timestamp},{service},{host},{message}"
+                if (
+                    service is not None
+                    and host is not None
+                    and message is not None
+                    and line.count(",") == 3
+                    and '"' not in line
+                    and "\n" not in line
+                    and "\r" not in line
+                ):
+                    write(line + "\r\n")
+                else:
+                    writer.writerow((timestamp, service, host, message))
 
 
 def write_level_csv(logs, out_dir):
@@ -119,26 +299,49 @@ def write_level_csv(logs, out_dir):
     if not logs:
         return
 
-    files = {}
+    rows_by_level = defaultdict(list)
 
     for log in logs:
+        rows_by_level[log["level"]].append(_level_row(log))
+
+    _write_level_files(rows_by_level, out_dir)
+
+
+def analyze(logs, out_dir):
+    # Does the work of write_daily_summary, write_level_csv,
+    # detect_burst_errors and detect_long_running_issues in a single pass,
+    # so `logs` can be a one-shot iterator such as iter_logs().
+    os.makedirs(out_dir, exist_ok=True)
+
+    summary = defaultdict(lambda: defaultdict(int))
+    rows_by_level = defaultdict(list)
+    error_times = []
+    error_days = defaultdict(set)
+
+    total = 0
+
+    # Bound to locals so the loop below avoids repeated attribute lookups
+    add_error_time = error_times.append
+    level_row = _level_row
+
+    for log in logs:
+        total += 1
+        timestamp = log["timestamp"]
+        day = timestamp.date()
         level = log["level"]
 
-        if level not in files:
-            f = open(os.path.join(out_dir, f"{level}.csv"), "w", newline="", encoding="utf-8")
-            writer = csv.writer(f)
-            writer.writerow(["timestamp", "service", "host", "message"])
-            files[level] = (f, writer)
+        summary[day][level] += 1
+        rows_by_level[level].append(level_row(log))
 
-        files[level][1].writerow([
-            log["timestamp"],
-            log["service"],
-            log["host"],
-            log["message"]
-        ])
+        if level == "ERROR":
+            add_error_time(timestamp)
+            error_days[log["message"]].add(day)
 
-    for f, _ in files.values():
-        f.close()
+    _write_summary_file(summary, out_dir)
+    _write_level_files(rows_by_level, out_dir)
+
+    error_times.sort()
+    return total, _find_bursts(error_times), _recurring_issues(error_days)
 
 
 def main():
@@ -149,23 +352,18 @@ def main():
     parser.add_argument("--out", default="output", help="Output folder")
     parser.add_argument("--service", help="Filter by service")
     parser.add_argument("--host", help="Filter by host")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for parsing the text log")
 
     args = parser.parse_args()
 
     print("PROGRAM STARTED")
 
-    logs = read_logs(args.json, args.log)
-    print("Logs loaded:", len(logs))
-
-    logs = filter_logs(logs, service=args.service, host=args.host)
-    print("Logs after filter:", len(logs))
-
-    write_daily_summary(logs, args.out)
-    write_level_csv(logs, args.out)
-
-    bursts = detect_burst_errors(logs)
-    issues = detect_long_running_issues(logs)
+    # Filtering happens while reading and every report is built in one
+    # pass; only the rows for the per-level CSV files are kept in memory
+    logs = iter_logs(args.json, args.log, service=args.service, host=args.host, workers=args.workers)
+    total, bursts, issues = analyze(logs, args.out)
 
+    print("Logs after filter:", total)
     print("Burst errors detected:", len(bursts))
     print("Long running issues detected:", len(issues))
     print("CSV files written to:", args.out)
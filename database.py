@@ -1,10 +1,17 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-engine = create_engine("sqlite:///logs.db")
-Session = sessionmaker(bind=engine)
 Base = declarative_base()
 
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL + NORMAL sync keeps large ingests from fsyncing every commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 class Log(Base):
     __tablename__ = "logs"
 
@@ -15,4 +22,27 @@ class Log(Base):
     host = Column(String)
     message = Column(String)
 
-Base.metadata.create_all(engine)
+
+def make_engine(url):
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False}
+    )
+    event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    Base.metadata.create_all(new_engine)
+    return new_engine
+
+
+engine = make_engine("sqlite:///logs.db")
+Session = sessionmaker(bind=engine)
+
+
+def bulk_insert(records, bind=None):
+    # One transaction, one executemany for the whole batch. An empty
+    # executemany would insert a single all-NULL row, so skip it.
+    records = list(records)
+    if not records:
+        return
+
+    with (bind or engine).begin() as conn:
+        conn.execute(Log.__table__.insert(), records)
@@ -1,4 +1,6 @@
+import csv
 import os
+import pytest
 from datetime import datetime
 import analyzer
 
@@ -32,6 +34,22 @@ def test_parse_text_log_invalid_timestamp():
     assert analyzer.parse_text_log(line) is None
 
 
+def test_parse_text_log_rejects_whitespace_inside_fields():
+    assert analyzer.parse_text_log("2025-01-01 10:00:00 ERROR payment h\tost2 Payment failed") is None
+    assert analyzer.parse_text_log("2025-01-01 10:00:00 ERROR pay\xa0ment host2 Payment failed") is None
+    assert analyzer.parse_text_log("2025-01-01 10:00:00 ERROR payment \thost2 Payment failed") is None
+
+
+def test_parse_text_log_accepts_unpadded_dates():
+    result = analyzer.parse_text_log("2025-1-1 1:0:0 E p h m")
+    assert result["timestamp"] == datetime(2025, 1, 1, 1, 0, 0)
+
+
+def test_parse_text_log_rejects_non_strptime_timestamps():
+    for ts in ("2025-01-01 10:00:01+05:00", "2025-01-01 10:00", "2025-01-01 10:00:01.5"):
+        assert analyzer.parse_text_log(f"{ts} ERROR payment host2 Failed") is None
+
+
 def test_read_logs_returns_list():
     logs = analyzer.read_logs(JSON_PATH, LOG_PATH)
     assert isinstance(logs, list)
@@ -98,3 +116,168 @@ def test_write_level_csv_creates_files():
 
     assert os.path.exists(f"{OUT_DIR}/ERROR.csv")
     assert os.path.exists(f"{OUT_DIR}/INFO.csv")
+
+
+def test_iter_logs_validates_inputs_eagerly():
+    with pytest.raises(ValueError):
+        analyzer.iter_logs(None, None)
+
+
+def test_iter_logs_filters_while_reading(tmp_path):
+    log_file = tmp_path / "app.log"
+    log_file.write_text(
+        "2025-01-01 10:00:00 ERROR payment host2 Payment failed\n"
+        "2025-01-01 10:00:05 INFO auth host1 Login ok\n",
+        encoding="utf-8",
+    )
+
+    logs = list(analyzer.iter_logs(None, str(log_file), service="auth"))
+
+    assert len(logs) == 1
+    assert logs[0]["host"] == "host1"
+
+
+def test_detect_burst_errors_finds_five_errors_in_a_minute():
+    logs = [
+        analyzer.parse_text_log(f"2025-01-01 10:00:{sec:02d} ERROR payment host2 Payment failed")
+        for sec in (0, 10, 20, 30, 40, 50)
+    ]
+    bursts = analyzer.detect_burst_errors(logs)
+
+    assert len(bursts) == 2
+    assert bursts[0][0] == datetime(2025, 1, 1, 10, 0, 0)
+    assert bursts[1][-1] == datetime(2025, 1, 1, 10, 0, 50)
+
+
+def test_analyze_matches_separate_passes(tmp_path):
+    logs = [
+        analyzer.parse_text_log(f"2025-01-0{day} 10:00:{sec:02d} {level} payment host2 Payment failed")
+        for day in (1, 2)
+        for sec, level in ((0, "ERROR"), (10, "INFO"), (20, "ERROR"), (30, "ERROR"), (40, "ERROR"), (50, "ERROR"))
+    ]
+    fused_dir = tmp_path / "fused"
+    separate_dir = tmp_path / "separate"
+
+    total, bursts, issues = analyzer.analyze(iter(logs), str(fused_dir))
+    analyzer.write_daily_summary(logs, str(separate_dir))
+    analyzer.write_level_csv(logs, str(separate_dir))
+
+    assert total == len(logs)
+    assert bursts and issues
+    assert bursts == analyzer.detect_burst_errors(logs)
+    assert issues == analyzer.detect_long_running_issues(logs)
+    for name in ("daily_summary.csv", "ERROR.csv", "INFO.csv"):
+        assert (fused_dir / name).read_bytes() == (separate_dir / name).read_bytes()
+
+
+def _write_mixed_newline_log(tmp_path):
+    log_file = tmp_path / "app.log"
+    lines = [
+        f"2025-01-01 10:00:{sec:02d} ERROR payment host2 Payment failed {sec}"
+        for sec in range(20)
+    ]
+    # A lone \r is a line break in text mode, so it must be one in chunks too
+    lines[5] += "\r2025-01-01 10:01:00 INFO auth host1 cr inside"
+    log_file.write_bytes(("\n".join(lines[:10]) + "\r\n" + "\n".join(lines[10:]) + "\n").encode("utf-8"))
+    return log_file
+
+
+def test_parse_log_chunk_splits_on_line_boundaries(tmp_path):
+    log_file = _write_mixed_newline_log(tmp_path)
+    size = log_file.stat().st_size
+    bounds = [0, 7, size // 2, size // 2 + 1, size]
+
+    chunks = [
+        analyzer._parse_log_chunk(str(log_file), start, end)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+    expected = analyzer.read_logs(None, str(log_file))
+    assert len(expected) == 21
+    assert [log for chunk in chunks for log in chunk] == expected
+
+
+def test_iter_logs_parallel_matches_sequential(tmp_path, monkeypatch):
+    log_file = _write_mixed_newline_log(tmp_path)
+    monkeypatch.setattr(analyzer, "_PARALLEL_CHUNK_BYTES", 100)
+
+    parallel = list(analyzer.iter_logs(None, str(log_file), workers=2))
+
+    assert parallel == analyzer.read_logs(None, str(log_file))
+
+
+def test_write_level_csv_quotes_special_messages(tmp_path):
+    logs = [
+        analyzer.parse_text_log("2025-01-01 10:00:00 ERROR payment host2 Payment failed"),
+        analyzer.parse_text_log('2025-01-01 10:00:01 ERROR payment host2 Card "1234", declined'),
+        {"timestamp": datetime(2025, 1, 1, 10, 0, 2), "level": "ERROR", "service": "payment", "host": None, "message": None},
+    ]
+    analyzer.write_level_csv(logs, str(tmp_path))
+
+    with open(tmp_path / "ERROR.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[1] == ["2025-01-01 10:00:00", "payment", "host2", "Payment failed"]
+    assert rows[2][3] == 'Card "1234", declined'
+    assert rows[3] == ["2025-01-01 10:00:02", "payment", "", ""]
+
+
+def test_read_logs_keeps_json_records_with_null_fields(tmp_path):
+    json_file = tmp_path / "app.json"
+    json_file.write_text(
+        '[{"timestamp": "2025-01-01T10:00:00", "level": "ERROR",'
+        ' "service": "payment", "host": null, "message": "Payment failed"}]',
+        encoding="utf-8",
+    )
+
+    logs = analyzer.read_logs(str(json_file), None)
+
+    assert len(logs) == 1
+    assert logs[0]["host"] is None
+    assert logs[0]["service"] == "payment"
+
+
+def test_write_daily_summary_groups_rows_by_date(tmp_path):
+    json_file = tmp_path / "app.json"
+    json_file.write_text(
+        '[{"timestamp": "2025-01-01T10:00:00", "level": "ERROR", "service": "p", "host": "h", "message": "m"},'
+        ' {"timestamp": "2025-01-02T10:00:00", "level": "ERROR", "service": "p", "host": "h", "message": "m"}]',
+        encoding="utf-8",
+    )
+    log_file = tmp_path / "app.log"
+    log_file.write_text("2025-01-01 11:00:00 INFO p h started\n", encoding="utf-8")
+
+    analyzer.write_daily_summary(analyzer.read_logs(str(json_file), str(log_file)), str(tmp_path))
+
+    with open(tmp_path / "daily_summary.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[1:] == [
+        ["2025-01-01", "ERROR", "1"],
+        ["2025-01-01", "INFO", "1"],
+        ["2025-01-02", "ERROR", "1"],
+    ]
+
+
+def test_bulk_insert_writes_rows_and_sets_pragmas(tmp_path, monkeypatch):
+    # Importing database creates logs.db in the working directory
+    monkeypatch.chdir(tmp_path)
+    database = pytest.importorskip("database")
+    engine = database.make_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    logs = analyzer.read_logs(
+        os.path.join(os.path.dirname(__file__), "sample_app.json"),
+        os.path.join(os.path.dirname(__file__), "sample_app.log"),
+    )
+    database.bulk_insert(logs, bind=engine)
+    database.bulk_insert([], bind=engine)
+
+    with engine.connect() as conn:
+        count = conn.exec_driver_sql("SELECT COUNT(*) FROM logs").scalar()
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+
+    assert count == len(logs) == 8
+    assert journal_mode == "wal"
+    assert synchronous == 1
+    engine.dispose()